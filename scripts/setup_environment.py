@@ -3,17 +3,47 @@
 Setup script for the portfolio optimization environment
 """
 
+import hashlib
+import shutil
 import subprocess
 import sys
+from importlib.util import find_spec
+from pathlib import Path
 
 def install_requirements():
     """Install required packages"""
+    # Skip installation entirely when this environment was already set up from the
+    # same requirements.txt
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        requirements_hash = hashlib.sha256(Path("requirements.txt").read_bytes()).hexdigest()
+    except OSError as e:
+        print(f"✗ Error reading requirements: {e}")
+        return False
+    stamp = Path(sys.prefix) / ".requirements.sha256"
+    if stamp.exists() and stamp.read_text() == requirements_hash:
+        print("✓ Requirements unchanged since last install, skipping install")
+        return True
+    
+    # Prefer uv's parallel resolver/installer when available, targeting the
+    # interpreter running this script; otherwise fall back to pip
+    uv = shutil.which("uv")
+    if uv:
+        command = [uv, "pip", "install", "--python", sys.executable, "-r", "requirements.txt"]
+    else:
+        command = [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+    
+    try:
+        subprocess.check_call(command)
         print("✓ All requirements installed successfully!")
     except subprocess.CalledProcessError as e:
         print(f"✗ Error installing requirements: {e}")
         return False
+    
+    try:
+        stamp.write_text(requirements_hash)
+    except OSError:
+        # Read-only interpreter prefix; the next run simply reinstalls
+        pass
     return True
 
 def verify_installation():
@@ -25,10 +55,10 @@ def verify_installation():
     
     missing_packages = []
     for package in required_packages:
-        try:
-            __import__(package)
+        # Locate the package without importing it (TensorFlow alone takes seconds)
+        if find_spec(package) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             missing_packages.append(package)
             print(f"✗ {package}")
     
@@ -5,40 +5,123 @@ Test all Jupyter notebooks for execution errors
 
 import os
 import sys
-import subprocess
 import glob
+import hashlib
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def test_notebook(notebook_path):
+import nbformat
+from jupyter_client.multikernelmanager import MultiKernelManager
+from jupyter_core.utils import run_sync
+from nbclient import NotebookClient
+from nbclient.exceptions import CellExecutionError, CellTimeoutError
+
+CACHE_DIR = Path(".test_cache")
+
+# Notebooks whose outputs other notebooks read (portfolio_optimization writes
+# data/portfolio_recommendation.pkl for backtesting and risk_management).
+# They run to completion before the rest start.
+PRODUCER_NOTEBOOKS = ("portfolio_optimization.ipynb",)
+
+# Data files each notebook reads, hashed into its cache key. A notebook's own
+# outputs are deliberately left out so re-running it does not invalidate it.
+NOTEBOOK_INPUTS = {
+    "portfolio_optimization.ipynb": ("data/arima_results.pkl", "data/lstm_results.pkl"),
+    "backtesting.ipynb": ("data/portfolio_recommendation.pkl",),
+    "risk_management.ipynb": ("data/portfolio_recommendation.pkl",),
+}
+
+def inputs_hash(notebook_path):
+    """
+    Hash a notebook together with the source modules and data files it reads
+    """
+    key = hashlib.sha256()
+    key.update(Path(notebook_path).read_bytes())
+    for source_file in sorted(Path("src").rglob("*.py")):
+        key.update(source_file.read_bytes())
+    for input_name in NOTEBOOK_INPUTS.get(Path(notebook_path).name, ()):
+        input_file = Path(input_name)
+        key.update(input_name.encode())
+        key.update(input_file.read_bytes() if input_file.exists() else b"<missing>")
+    return key.hexdigest()
+
+async def prepare_kernel(client, notebook_dir):
+    """
+    Connect to a pooled kernel and reset it for the next notebook
+    """
+    client.start_channels()
+    await client.wait_for_ready(timeout=60)
+    # Clear the previous notebook's variables (imported modules stay loaded)
+    # and run from the notebook's own directory like nbconvert does
+    await client.execute_interactive(
+        f"%reset -f\n__import__('os').chdir({notebook_dir!r})",
+        store_history=False,
+        timeout=60
+    )
+
+def test_notebook(notebook_path, kernel_manager, kernel_pool):
     """
     Test a single notebook by executing it
+
+    Returns a (success, output) tuple with the notebook's log buffered in output.
     """
-    print(f"Testing {notebook_path}...")
+    output = [f"Testing {notebook_path}..."]
+    
+    # Skip notebooks whose inputs match the last successful run
+    stamp = CACHE_DIR / f"{Path(notebook_path).name}.sha256"
+    if stamp.exists() and stamp.read_text() == inputs_hash(notebook_path):
+        output.append(f"⏭️  {notebook_path} - UNCHANGED, skipped")
+        return True, "\n".join(output)
     
+    kernel_id = kernel_pool.get()
+    client = None
+    success = False
     try:
-        # Execute notebook
-        result = subprocess.run([
-            'jupyter', 'nbconvert', 
-            '--to', 'notebook',
-            '--execute',
-            '--inplace',
-            notebook_path
-        ], capture_output=True, text=True, timeout=600)
+        if kernel_id is None:
+            kernel_id = kernel_manager.start_kernel(kernel_name='python3')
+        kernel = kernel_manager.get_kernel(kernel_id)
+        # nbclient needs an async client: with a blocking one its output
+        # polling blocks the event loop and cell timeouts never fire
+        kernel.client_class = 'jupyter_client.asynchronous.AsyncKernelClient'
+        client = kernel.client()
+        notebook_dir = os.path.abspath(os.path.dirname(notebook_path))
+        run_sync(prepare_kernel)(client, notebook_dir)
+        
+        nb = nbformat.read(notebook_path, as_version=4)
+        NotebookClient(nb, km=kernel, kc=client, timeout=600).execute()
+        nbformat.write(nb, notebook_path)
+        
+        # Stamp the notebook as written back, outputs included
+        CACHE_DIR.mkdir(exist_ok=True)
+        stamp.write_text(inputs_hash(notebook_path))
         
-        if result.returncode == 0:
-            print(f"✅ {notebook_path} - PASSED")
-            return True
-        else:
-            print(f"❌ {notebook_path} - FAILED")
-            print(f"Error: {result.stderr}")
-            return False
+        success = True
+        output.append(f"✅ {notebook_path} - PASSED")
+        return True, "\n".join(output)
             
-    except subprocess.TimeoutExpired:
-        print(f"⏰ {notebook_path} - TIMEOUT")
-        return False
+    except CellTimeoutError:
+        output.append(f"⏰ {notebook_path} - TIMEOUT")
+        return False, "\n".join(output)
+    except CellExecutionError as e:
+        output.append(f"❌ {notebook_path} - FAILED")
+        output.append(f"Error: {e}")
+        return False, "\n".join(output)
     except Exception as e:
-        print(f"💥 {notebook_path} - ERROR: {e}")
-        return False
+        output.append(f"💥 {notebook_path} - ERROR: {e}")
+        return False, "\n".join(output)
+    finally:
+        if client is not None:
+            client.stop_channels()
+        # A failed notebook can leave its kernel busy or dead, so hand the
+        # next notebook a fresh one instead
+        if kernel_id is not None and not success:
+            try:
+                kernel_manager.shutdown_kernel(kernel_id, now=True)
+            except Exception:
+                pass
+            kernel_id = None
+        kernel_pool.put(kernel_id)
 
 def main():
     """
@@ -51,7 +134,12 @@ def main():
         sys.exit(1)
     
     # Find all notebook files
-    notebook_files = list(notebooks_dir.glob("*.ipynb"))
+    # scandir exposes entry types without an extra stat call per file
+    with os.scandir(notebooks_dir) as entries:
+        notebook_files = sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".ipynb") and entry.is_file(follow_symlinks=False)
+        )
     
     if not notebook_files:
         print("❌ No notebook files found!")
@@ -60,11 +148,35 @@ def main():
     print(f"Found {len(notebook_files)} notebooks to test")
     print("=" * 50)
     
-    # Test each notebook
+    # Worker threads drive notebooks concurrently, each on its own pooled kernel
     results = []
-    for notebook in notebook_files:
-        success = test_notebook(str(notebook))
-        results.append((notebook.name, success))
+    max_workers = min(len(notebook_files), os.cpu_count() or 1)
+    
+    # One reusable kernel slot per worker, so kernel startup and heavy imports
+    # such as TensorFlow are paid once per slot rather than once per notebook.
+    # Slots start as None and get a kernel on first use. Each notebook's log is
+    # buffered and printed here so concurrent runs do not interleave.
+    kernel_manager = MultiKernelManager()
+    kernel_pool = queue.Queue()
+    for _ in range(max_workers):
+        kernel_pool.put(None)
+    
+    producers = [n for n in notebook_files if n.name in PRODUCER_NOTEBOOKS]
+    consumers = [n for n in notebook_files if n.name not in PRODUCER_NOTEBOOKS]
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for phase in (producers, consumers):
+                futures = [
+                    executor.submit(test_notebook, str(notebook), kernel_manager, kernel_pool)
+                    for notebook in phase
+                ]
+                for notebook, future in zip(phase, futures):
+                    success, output = future.result()
+                    print(output)
+                    results.append((notebook.name, success))
+    finally:
+        kernel_manager.shutdown_all(now=True)
     
     # Summary
     print("\n" + "=" * 50)